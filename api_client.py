@@ -1,28 +1,53 @@
 import os
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 import streamlit as st
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 from time import sleep
 import logging
 
-@st.cache_data(ttl=300)
-def cached_api_request(url: str, headers: Dict[str, str]) -> Optional[Dict[str, Any]]:
-    """Cached API request"""
-    try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        st.error(f"API Error: {str(e)}")
-        return None
+def _fetch_json(url: str, headers: Dict[str, str],
+                session: Optional[requests.Session] = None) -> Dict[str, Any]:
+    """Performs an API request and decodes the JSON response (raises on failure, so errors are not cached)"""
+    http = session if session is not None else requests
+    response = http.get(url, headers=headers, timeout=10)
+    response.raise_for_status()
+    # orjson decodes straight from the raw bytes
+    return orjson.loads(response.content)
+
+@st.cache_data(ttl="5m", max_entries=500)
+def cached_api_request(url: str, headers: Dict[str, str],
+                       _session: Optional[requests.Session] = None) -> Dict[str, Any]:
+    """Cached API request for player and club data (the session is not part of the cache key)"""
+    return _fetch_json(url, headers, _session)
+
+@st.cache_data(ttl="15m", max_entries=500)
+def cached_ranking_request(url: str, headers: Dict[str, str],
+                           _session: Optional[requests.Session] = None) -> Dict[str, Any]:
+    """Cached API request for global rankings"""
+    return _fetch_json(url, headers, _session)
+
+@st.cache_data(ttl="1h", max_entries=500)
+def cached_static_request(url: str, headers: Dict[str, str],
+                          _session: Optional[requests.Session] = None) -> Dict[str, Any]:
+    """Cached API request for the brawler catalogue, which rarely changes"""
+    return _fetch_json(url, headers, _session)
 
 class BrawlStarsAPI:
+    # Large enough for the concurrent fetches of the comparison and extended stats pages
+    POOL_MAXSIZE = 32
+
     def __init__(self, api_key: str):
         self.base_url = "https://api.brawlstars.com/v1"
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Accept": "application/json"
         }
+        # One pooled session so keep-alive connections are reused across requests
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        self._session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=self.POOL_MAXSIZE))
 
     def _clean_tag(self, tag: str) -> str:
         """Cleans a player or club tag."""
@@ -30,52 +55,53 @@ class BrawlStarsAPI:
             tag = f'#{tag}'
         return tag.upper().replace('#', '%23').replace(' ', '')
 
+    def _request(self, cached_request: Callable[..., Dict[str, Any]], url: str) -> Optional[Dict[str, Any]]:
+        """Runs a cached request and reports failures outside the cache, so the next call retries"""
+        try:
+            return cached_request(url, self.headers, self._session)
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+            st.error(f"API Error: {str(e)}")
+            return None
+
     def get_player_info(self, player_tag: str) -> Optional[Dict[str, Any]]:
         """Retrieves player information."""
         clean_tag = self._clean_tag(player_tag)
         url = f"{self.base_url}/players/{clean_tag}"
-        return cached_api_request(url, self.headers)
+        return self._request(cached_api_request, url)
 
     def get_battle_log(self, player_tag: str) -> Optional[Dict[str, Any]]:
         """Retrieves the battle log of a player."""
         clean_tag = self._clean_tag(player_tag)
         url = f"{self.base_url}/players/{clean_tag}/battlelog"
-        return cached_api_request(url, self.headers)
+        return self._request(cached_api_request, url)
 
     def get_club_info(self, club_tag: str) -> Optional[Dict[str, Any]]:
         """Retrieves club information."""
         clean_tag = self._clean_tag(club_tag)
         url = f"{self.base_url}/clubs/{clean_tag}"
-        return cached_api_request(url, self.headers)
+        return self._request(cached_api_request, url)
 
     def get_club_members(self, club_tag: str) -> Optional[Dict[str, Any]]:
         """Retrieves club members."""
         clean_tag = self._clean_tag(club_tag)
         url = f"{self.base_url}/clubs/{clean_tag}/members"
-        return cached_api_request(url, self.headers)
+        return self._request(cached_api_request, url)
 
     def get_brawler_list(self) -> Optional[Dict[str, Any]]:
         """Retrieves the list of all brawlers."""
         url = f"{self.base_url}/brawlers"
-        return cached_api_request(url, self.headers)
+        return self._request(cached_static_request, url)
 
     def get_brawler_info(self, brawler_id: int) -> Optional[Dict[str, Any]]:
         """Retrieves brawler information."""
         url = f"{self.base_url}/brawlers/{brawler_id}"
-        return cached_api_request(url, self.headers)
+        return self._request(cached_static_request, url)
 
     def get_brawlers(self) -> Optional[Dict[str, Any]]:
         """Gets the list of all available brawlers"""
-        return self._get_brawlers_cached(self.headers, self.base_url)
-
-    @staticmethod
-    @st.cache_data(ttl=300)
-    def _get_brawlers_cached(_headers: Dict[str, str], _base_url: str) -> Optional[Dict[str, Any]]:
-        """Cached version of the brawler query"""
-        url = f"{_base_url}/brawlers"
-        return cached_api_request(url, _headers)
+        return self.get_brawler_list()
 
     def get_brawler_rankings(self, brawler_id: str) -> Optional[Dict[str, Any]]:
         """Retrieves the global ranking for a specific brawler."""
         url = f"{self.base_url}/rankings/global/brawlers/{brawler_id}"
-        return cached_api_request(url, self.headers)
+        return self._request(cached_ranking_request, url)
@@ -1,9 +1,26 @@
 from typing import Dict, List, Tuple, Any
 from datetime import datetime
 import pandas as pd
+import numpy as np
 import requests
+import streamlit as st
 import logging
 
+# Base URL of the custom statistics API (extended stats for selected players)
+CUSTOM_API_URL = "http://13.49.97.84:8000"
+
+@st.cache_data(ttl="5m", max_entries=500)
+def _fetch_custom_statistics(endpoint: str, player_tag: str, start_date: str = None, end_date: str = None) -> Dict:
+    """Cached request to the custom statistics API (raises on failure, so errors are not cached)"""
+    params = {"player_tag": player_tag}
+    if start_date:
+        params["start_date"] = start_date
+    if end_date:
+        params["end_date"] = end_date
+    response = requests.get(f"{CUSTOM_API_URL}/{endpoint}", params=params)
+    response.raise_for_status()
+    return response.json()
+
 class BrawlStarsDataProcessor:
     """
     Processes and formats data from the Brawl Stars API.
@@ -135,6 +152,54 @@ class BrawlStarsDataProcessor:
         
         return formatted_battles, star_player_count
 
+    def summarize_battle_log(self, battles: Dict, player_tag: str) -> Dict[str, Any]:
+        """
+        Formats a battle log and calculates its statistics in one pass.
+        
+        Args:
+            battles (Dict): Raw battle log data
+            player_tag (str): Player's tag to identify their data
+            
+        Returns:
+            Dict[str, Any]: Formatted battles (as list and typed DataFrame),
+                trophy changes as int32 array, star player count and battle statistics
+        """
+        formatted_battles, star_player_count = self.format_battle_log(battles, player_tag)
+        trophy_changes = np.fromiter(
+            (battle['Trophy Change'] for battle in formatted_battles),
+            dtype=np.int32,
+            count=len(formatted_battles)
+        )
+        return {
+            'battles': formatted_battles,
+            'table': self._battles_to_frame(formatted_battles, trophy_changes),
+            'trophy_changes': trophy_changes,
+            'star_count': star_player_count,
+            'statistics': self.calculate_battle_statistics(formatted_battles)
+        }
+
+    @staticmethod
+    def _battles_to_frame(formatted_battles: List[Dict], trophy_changes: np.ndarray) -> pd.DataFrame:
+        """
+        Builds a typed DataFrame column by column from the formatted battles.
+
+        Args:
+            formatted_battles (List[Dict]): Battles as returned by format_battle_log
+            trophy_changes (np.ndarray): Trophy change per battle as int32 array
+
+        Returns:
+            pd.DataFrame: Battle table with int32 trophy changes and categorical results
+        """
+        if not formatted_battles:
+            return pd.DataFrame()
+        columns = {
+            key: [battle[key] for battle in formatted_battles]
+            for key in formatted_battles[0]
+        }
+        columns['Trophy Change'] = trophy_changes
+        columns['Result'] = pd.Categorical(columns['Result'])
+        return pd.DataFrame(columns)
+
     @staticmethod
     def _format_single_battle(battle: Dict[str, Any], player_tag: str) -> Dict[str, Any]:
         """
@@ -420,18 +485,7 @@ class BrawlStarsDataProcessor:
             end_date (str, optional): End date in ISO format
         """
         try:
-            params = {"player_tag": player_tag}
-            if start_date:
-                params["start_date"] = start_date
-            if end_date:
-                params["end_date"] = end_date
-                
-            response = requests.get(
-                f"http://13.49.97.84:8000/battle-statistics",
-                params=params
-            )
-            response.raise_for_status()
-            data = response.json()
+            data = _fetch_custom_statistics("battle-statistics", player_tag, start_date, end_date)
             logging.info(f"API Response: {data}")
             return {
                 "first_battle": data.get("first_battle", "").replace("T", " ").replace("Z", ""),
@@ -456,18 +510,7 @@ class BrawlStarsDataProcessor:
             end_date (str, optional): End date in ISO format
         """
         try:
-            params = {"player_tag": player_tag}
-            if start_date:
-                params["start_date"] = start_date
-            if end_date:
-                params["end_date"] = end_date
-                
-            response = requests.get(
-                f"http://13.49.97.84:8000/trophy-progress",
-                params=params
-            )
-            response.raise_for_status()
-            return response.json()
+            return _fetch_custom_statistics("trophy-progress", player_tag, start_date, end_date)
         except Exception as e:
             logging.error(f"Error fetching trophy progress: {e}")
             return {}
@@ -482,18 +525,7 @@ class BrawlStarsDataProcessor:
             end_date (str, optional): End date in ISO format
         """
         try:
-            params = {"player_tag": player_tag}
-            if start_date:
-                params["start_date"] = start_date
-            if end_date:
-                params["end_date"] = end_date
-                
-            response = requests.get(
-                f"http://13.49.97.84:8000/brawler-statistics",
-                params=params
-            )
-            response.raise_for_status()
-            return response.json()
+            return _fetch_custom_statistics("brawler-statistics", player_tag, start_date, end_date)
         except Exception as e:
             logging.error(f"Error fetching brawler statistics: {e}")
             return {}
@@ -508,18 +540,7 @@ class BrawlStarsDataProcessor:
             end_date (str, optional): End date in ISO format
         """
         try:
-            params = {"player_tag": player_tag}
-            if start_date:
-                params["start_date"] = start_date
-            if end_date:
-                params["end_date"] = end_date
-                
-            response = requests.get(
-                f"http://13.49.97.84:8000/gamemode-statistics",
-                params=params
-            )
-            response.raise_for_status()
-            return response.json()
+            return _fetch_custom_statistics("gamemode-statistics", player_tag, start_date, end_date)
         except Exception as e:
             logging.error(f"Error fetching gamemode statistics: {e}")
             return {}
@@ -534,18 +555,7 @@ class BrawlStarsDataProcessor:
             end_date (str, optional): End date in ISO format
         """
         try:
-            params = {"player_tag": player_tag}
-            if start_date:
-                params["start_date"] = start_date
-            if end_date:
-                params["end_date"] = end_date
-                
-            response = requests.get(
-                f"http://13.49.97.84:8000/map-statistics",
-                params=params
-            )
-            response.raise_for_status()
-            return response.json()
+            return _fetch_custom_statistics("map-statistics", player_tag, start_date, end_date)
         except Exception as e:
             logging.error(f"Error fetching map statistics: {e}")
             return {}
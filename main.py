@@ -1,17 +1,24 @@
 import os
-from typing import Dict, Tuple, Optional
+from typing import Dict, Tuple, Optional, Callable, Any, List, Iterator, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from collections import Counter
 from dotenv import load_dotenv
 import streamlit as st
-import streamlit.components.v1 as components
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
+import numpy as np
 import logging
-import plotly.express as px
-import together
-import json
+import orjson
+import re
+from urllib.parse import quote
 import pathlib
-from bs4 import BeautifulSoup
 import shutil
 import plotly.graph_objects as go
+import plotly.io as pio
+
+# Serialize figures for the browser with orjson instead of the stdlib json encoder
+pio.json.config.default_engine = "orjson"
 
 # Set page config must be the first Streamlit command
 st.set_page_config(
@@ -20,13 +27,14 @@ st.set_page_config(
     layout="wide"
 )
 
-def inject_ga():
-    """Inject Google Analytics code into Streamlit's index.html"""
+@st.cache_resource
+def inject_ga() -> bool:
+    """Inject Google Analytics code into Streamlit's index.html (once per server process)"""
     GA_ID = "google_analytics"
 
     GA_JS = """
     <!-- Global site tag (gtag.js) - Google Analytics -->
-    <script async src="https://www.googletagmanager.com/gtag/js?id=G-NCG7739DG5"></script>
+    <script async id="google_analytics" src="https://www.googletagmanager.com/gtag/js?id=G-NCG7739DG5"></script>
     <script>
         window.dataLayer = window.dataLayer || [];
         function gtag(){dataLayer.push(arguments);}
@@ -39,29 +47,215 @@ def inject_ga():
     # Insert the script in the head tag of the static template
     index_path = pathlib.Path(st.__file__).parent / "static" / "index.html"
     logging.info(f'editing {index_path}')
-    soup = BeautifulSoup(index_path.read_text(), features="html.parser")
-    if not soup.find(id=GA_ID): 
+    # A substring check is enough to detect the tag, no HTML parsing needed
+    if GA_ID not in index_path.read_text():
         bck_index = index_path.with_suffix('.bck')
         if bck_index.exists():
             shutil.copy(bck_index, index_path)  
         else:
             shutil.copy(index_path, bck_index)  
-        html = str(soup)
-        new_html = html.replace('<head>', '<head>\n' + GA_JS)
+        index_html = index_path.read_text()
+        new_html = index_html.replace('<head>', '<head>\n' + GA_JS, 1)
         index_path.write_text(new_html)
+    return True
 
 # Inject Google Analytics
 inject_ga()
 
 from api_client import BrawlStarsAPI
 from data_processor import BrawlStarsDataProcessor
-from ui_components import BrawlStarsUI
+from ui_components import BrawlStarsUI, metric_grid_html
 
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+# Brawl Stars tags only use these characters, so malformed input never reaches the API
+_TAG_RE = re.compile(r'^#[0289PYLQGRJCUV]{3,14}$')
+
+def _run_parallel(*tasks: Callable[[], Any]) -> List[Any]:
+    """Runs independent (I/O bound) tasks concurrently and returns their results in order"""
+    # Worker threads need the script context so cached API calls and st.error keep working
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(
+        max_workers=len(tasks) or 1,
+        initializer=add_script_run_ctx,
+        initargs=(None, ctx)
+    ) as executor:
+        futures = [executor.submit(task) for task in tasks]
+        return [future.result() for future in futures]
+
+class _IncompletePlayerBundle(Exception):
+    """Raised with the partial (player_data, battle_log) result so that st.cache_data does not store it"""
+
+@st.cache_data(ttl=60, max_entries=200)
+def _fetch_player_bundle(_api_client: BrawlStarsAPI, player_tag: str) -> Tuple[Dict, Dict]:
+    """Fetches player info and battle log of one player concurrently (only complete results are cached)"""
+    player_data, battle_log = _run_parallel(
+        lambda: _api_client.get_player_info(player_tag),
+        lambda: _api_client.get_battle_log(player_tag)
+    )
+    if player_data is None or battle_log is None:
+        raise _IncompletePlayerBundle(player_data, battle_log)
+    return player_data, battle_log
+
+def _get_player_bundle(_api_client: BrawlStarsAPI, player_tag: str) -> Tuple[Optional[Dict], Optional[Dict]]:
+    """Fetches player info and battle log of one player, a failed request leaves its element None"""
+    try:
+        return _fetch_player_bundle(_api_client, player_tag)
+    except _IncompletePlayerBundle as e:
+        return e.args
+
+@st.cache_data(ttl="1h")
+def _load_sorted_brawlers(_api_client: BrawlStarsAPI) -> Tuple[List[Dict], Tuple[str, ...]]:
+    """
+    Loads the brawler catalogue sorted alphabetically together with the lowercased names for searching.
+    Raises ValueError when the catalogue cannot be loaded, so the failure is not cached.
+    """
+    brawlers_data = _api_client.get_brawlers()
+    if not brawlers_data or 'items' not in brawlers_data:
+        raise ValueError("Brawler catalogue unavailable")
+    brawlers = sorted(brawlers_data['items'], key=lambda x: x.get('name', ''))
+    return brawlers, tuple(b['name'].lower() for b in brawlers)
+
+@st.cache_resource
+def _load_tips_index() -> Dict[str, Dict]:
+    """Loads BrawlerTips.json once per server process and indexes the tips by lowercased brawler name"""
+    tips_data = orjson.loads(pathlib.Path('BrawlerTips.json').read_bytes())
+    return {brawler['brawlerName'].lower(): brawler['tips'] for brawler in tips_data['brawlers']}
+
+# Layout shared by the charts: transparent plot background, fixed height
+_TRANSPARENT_LAYOUT = dict(plot_bgcolor='rgba(0,0,0,0)', height=400)
+
+# Column configurations of the tables (built once instead of on every rerun)
+_RANKING_COLCFG = {
+    'Rank': st.column_config.NumberColumn(format="%d"),
+    'Trophies': st.column_config.NumberColumn(format="%d")
+}
+
+_MEMBERS_COLCFG = {
+    'Name': st.column_config.TextColumn('Name'),
+    'Role': st.column_config.TextColumn('Role'),
+    'Trophies': st.column_config.NumberColumn('Trophies', format="%d"),
+    'Tag': st.column_config.TextColumn('Tag')
+}
+
+_BRAWLER_STATS_COLCFG = {
+    "brawler_name": st.column_config.TextColumn("Brawler", width="medium"),
+    "battles": st.column_config.NumberColumn("Battles", width="small"),
+    "victories": st.column_config.NumberColumn("Victories", width="small"),
+    "trophy_change": st.column_config.NumberColumn("Trophy Δ", width="small"),
+    "win_rate": st.column_config.NumberColumn("Win Rate", width="small", format="%.1f%%")
+}
+
+_GAMEMODE_COLCFG = {
+    "battle_mode": st.column_config.TextColumn("Game Mode", width="medium"),
+    "battles": st.column_config.NumberColumn("Battles", width="small"),
+    "victories": st.column_config.NumberColumn("Victories", width="small"),
+    "trophy_change": st.column_config.NumberColumn("Trophy Δ", width="small"),
+    "win_rate": st.column_config.NumberColumn("Win Rate", width="small", format="%.1f%%"),
+    "avg_duration": st.column_config.NumberColumn("Avg Duration", width="small", format="%.1f s"),
+    "avg_trophies_per_battle": st.column_config.NumberColumn("Trophies/Battle", width="small", format="%.2f"),
+    "seconds_per_trophy": st.column_config.NumberColumn("Seconds/Trophy", width="small", format="%.1f")
+}
+
+_MAP_COLCFG = {
+    "event_map": st.column_config.TextColumn("Map", width="medium"),
+    "battle_mode": st.column_config.TextColumn("Mode", width="small"),
+    "battles": st.column_config.NumberColumn("Battles", width="small"),
+    "victories": st.column_config.NumberColumn("Victories", width="small"),
+    "trophy_change": st.column_config.NumberColumn("Trophy Δ", width="small"),
+    "win_rate": st.column_config.NumberColumn("Win Rate", width="small", format="%.1f%%"),
+    "avg_duration": st.column_config.NumberColumn("Avg Duration", width="small", format="%.1f s"),
+    "avg_trophies_per_battle": st.column_config.NumberColumn("Trophies/Battle", width="small", format="%.2f"),
+    "most_played": st.column_config.TextColumn("Most Played", width="small"),
+    "most_trophies": st.column_config.TextColumn("Most Trophies By", width="small")
+}
+
+# Compact dtypes for the columns shared by the extended statistics tables
+_STAT_DTYPES = {'battles': 'int32', 'victories': 'int32', 'trophy_change': 'int32', 'win_rate': 'float32'}
+
+# Prompt for the AI comparison, filled with one player block per player
+_AI_PLAYER_TEMPLATE = """({name}):
+- Highest Trophies: {highest_trophies}
+- 3vs3 Victories: {victories_3vs3}
+- Solo Victories: {solo_victories}
+- Duo Victories: {duo_victories}
+- Club Trophies: {club_trophies}
+- Total Brawlers: {total_brawlers}
+- Brawlers Power 9+: {high_level_brawlers}
+- Brawlers Power 11: {max_level_brawlers}
+- Recent Win Rate: {win_rate:.1f}%
+- Star Player Count: {star_count}"""
+
+_AI_PROMPT_TEMPLATE = """
+Compare these two Brawl Stars players based on their statistics:
+
+Player 1 {player1}
+
+Player 2 {player2}
+
+Create a concise analysis, in maximum 6-8 sentences, comparing these players.
+Highlight key differences and mention who is stronger in which areas.
+Just one paragraph in response.
+Classify the players based on their trophy count using this scale: Beginner (0 to 700), Novice (701 to 3,000), Intermediate (3,001 to 10,000), Proficient (10,001 to 20,000), Advanced (20,001 to 50,000), Expert (50,001+).
+Focus on the most significant stats that show the skill and progress level of each player.
+"""
+
+# Card shown for every star power and gadget on the brawler page
+_ABILITY_CARD_HTML = (
+    "<div style='padding: 10px; border: 1px solid #ddd; border-radius: 5px; "
+    "margin: 5px; background-color: rgba(255,255,255,0.05);'>"
+    "<h4>{name}</h4></div>"
+)
+
+_EXTENDED_STATS_LINK_HTML = (
+    "<div style='text-align: center; padding: 10px;'>"
+    "<a href=\"?page=extended_stats&player_tag={tag}\" target=\"_self\">"
+    "📊 Advanced Battle Statistics available</a></div>"
+)
+
+def _render_ability_cards(names: Iterable[str]) -> str:
+    """Renders the cards of one ability section (star powers or gadgets) as a single HTML string"""
+    return "".join(_ABILITY_CARD_HTML.format(name=name) for name in names)
+
+def _render_metric_section(title: str, metrics: List[Tuple[str, str]]) -> str:
+    """Renders a headed row of metrics as markdown with an HTML grid"""
+    return f"### {title}\n\n{metric_grid_html(metrics, columns=len(metrics))}"
+
+def _extended_stats_link(player_tag: str) -> str:
+    """Builds the link to the extended statistics page of a player"""
+    return _EXTENDED_STATS_LINK_HTML.format(tag=quote(player_tag, safe=''))
+
+@st.cache_data(ttl="5m", max_entries=50)
+def _load_member_options(_api_client: BrawlStarsAPI, club_tag: str) -> Tuple[List[str], Dict[str, int]]:
+    """
+    Loads the member select options of a club together with a name -> option index map.
+    Raises ValueError when the members cannot be loaded, so the failure is not cached.
+    """
+    members = _api_client.get_club_members(club_tag)
+    if not members:
+        raise ValueError(club_tag)
+    member_list = [f"{m['name']} ({m['tag']})" for m in members['items']]
+    name_to_idx = {}
+    for i, member in enumerate(members['items']):
+        name_to_idx.setdefault(member['name'], i)
+    return member_list, name_to_idx
+
+@st.cache_resource
+def get_clients() -> Tuple[BrawlStarsAPI, BrawlStarsDataProcessor, BrawlStarsUI]:
+    """
+    Creates the API client, data processor and UI once per server process.
+    The instances are shared by all sessions, so they must not hold per-user state.
+    """
+    load_dotenv()
+    api_key = os.getenv("BRAWLSTARS_API_KEY")
+    if not api_key:
+        raise ValueError("BRAWLSTARS_API_KEY must be defined in .env")
+    data_processor = BrawlStarsDataProcessor()
+    return BrawlStarsAPI(api_key), data_processor, BrawlStarsUI(data_processor)
+
 class BrawlStarsApp:
     # Predefined club tags (starting with '#')
     CLUB_TAGS = {
@@ -71,25 +265,19 @@ class BrawlStarsApp:
         "MA NAJJACI SMOO": "#2UU9UlJUR",
         "Spike": "#2YJQ8LRCG"
     }
+    CLUB_NAMES = tuple(CLUB_TAGS)
+    DEFAULT_CLUB_INDEX = CLUB_NAMES.index("Venom Vipers")
 
     def __init__(self):
         """Initialize the app with API key and clients"""
+        self.api_client, self.data_processor, self.ui = get_clients()
         self._load_environment()
-        self.api_client = BrawlStarsAPI(self.api_key)
-        self.data_processor = BrawlStarsDataProcessor()
-        self.ui = BrawlStarsUI(self.data_processor)
 
     def _load_environment(self) -> None:
-        """Load environment variables"""
-        load_dotenv()
-        self.api_key = os.getenv("BRAWLSTARS_API_KEY")
+        """Load the Together AI key (get_clients reads the .env file and checks BRAWLSTARS_API_KEY)"""
         self.together_api_key = os.getenv("TOGETHER_API_KEY")
-        if not self.api_key:
-            raise ValueError("BRAWLSTARS_API_KEY must be defined in .env")
         if not self.together_api_key:
             raise ValueError("TOGETHER_API_KEY must be defined in .env")
-        # Initialize Together AI
-        together.api_key = self.together_api_key
 
     def run(self) -> None:
         """Main method to run the app"""
@@ -134,8 +322,15 @@ class BrawlStarsApp:
         """Shows the player comparison page"""
         st.title("Brawl Stars Player Comparison")
         
-        # Load club information
-        club_info = self._load_club_info()
+        # Load club information once per session (refresh on demand); an incomplete
+        # result is not kept, so the clubs that failed are requested again on the next rerun
+        if st.button("🔄 Refresh Clubs"):
+            st.session_state.pop('club_info', None)
+        club_info = st.session_state.get('club_info')
+        if club_info is None:
+            club_info = self._load_club_info()
+            if len(club_info) == len(self.CLUB_TAGS):
+                st.session_state.club_info = club_info
         
         # Player selection
         player1_tag, player2_tag = self._setup_player_selection(club_info)
@@ -153,15 +348,29 @@ class BrawlStarsApp:
         if 'selected_brawler_name' not in st.session_state:
             st.session_state.selected_brawler_name = None
         
-        # Load all brawlers
-        brawlers_data = self.api_client.get_brawlers()
-        
-        if not brawlers_data or 'items' not in brawlers_data:
+        # Selection, details and tips rerun on their own when the selection changes
+        self._display_brawler_browser()
+
+        # Nach der AI-Analyse Anzeige
+        st.markdown(
+            """
+            <div style='text-align: right; font-size: 0.8em; color: #888;'>
+                AI analysis powered by Together AI. 
+                <a href='https://buymeacoffee.com/brawlerinsight' target='_blank'>Support this feature</a>
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
+
+    @st.fragment
+    def _display_brawler_browser(self) -> None:
+        """Shows the brawler selection with details and tips of the selected brawler"""
+        # Load all brawlers, sorted alphabetically
+        try:
+            brawlers, lowered_names = _load_sorted_brawlers(self.api_client)
+        except ValueError:
             st.error("Error loading brawler data")
             return
-
-        # Get all brawlers and sort them alphabetically
-        brawlers = sorted(brawlers_data.get('items', []), key=lambda x: x.get('name', ''))
         
         # Create a grid layout for brawler selection
         st.write("### Select Brawler")
@@ -171,26 +380,23 @@ class BrawlStarsApp:
         
         # Filter brawlers based on search
         if search_term:
-            brawlers = [b for b in brawlers if search_term in b['name'].lower()]
+            brawlers = [b for b, name in zip(brawlers, lowered_names) if search_term in name]
         
-        # Create a grid of brawlers using columns
-        cols_per_row = 6  # Number of brawlers per row
-        
-        for i in range(0, len(brawlers), cols_per_row):
-            cols = st.columns(cols_per_row)
-            for j, col in enumerate(cols):
-                if i + j < len(brawlers):
-                    brawler = brawlers[i + j]
-                    # Create a button with brawler name
-                    if col.button(
-                        brawler['name'],
-                        key=f"brawler_{brawler['id']}",
-                        use_container_width=True
-                    ):
-                        st.session_state.selected_brawler = brawler['id']
-                        st.session_state.selected_brawler_name = brawler['name']
-                        # Scroll to top when a brawler is selected
-                        st.rerun()
+        # Select the brawler with a single widget instead of one button per brawler
+        names = [b['name'] for b in brawlers]
+        selected_name = st.session_state.selected_brawler_name
+        chosen = st.selectbox(
+            "Select Brawler",
+            names,
+            index=names.index(selected_name) if selected_name in names else None,
+            key="brawler_pick",
+            placeholder="Choose a brawler",
+            label_visibility="collapsed"
+        )
+        if chosen:
+            brawler = brawlers[names.index(chosen)]
+            st.session_state.selected_brawler = brawler['id']
+            st.session_state.selected_brawler_name = brawler['name']
 
         # Show selected brawler details in an expander
         if 'selected_brawler' in st.session_state and st.session_state.selected_brawler_name:
@@ -225,17 +431,6 @@ class BrawlStarsApp:
             else:
                 st.info(f"No tips available for {st.session_state.selected_brawler_name}")
 
-        # Nach der AI-Analyse Anzeige
-        st.markdown(
-            """
-            <div style='text-align: right; font-size: 0.8em; color: #888;'>
-                AI analysis powered by Together AI. 
-                <a href='https://buymeacoffee.com/brawlerinsight' target='_blank'>Support this feature</a>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-
     def _show_brawler_details(self, brawler_id: str, brawler_name: str) -> None:
         """Shows detailed information for a selected brawler"""
         st.subheader(f"Details for {brawler_name}")
@@ -252,71 +447,60 @@ class BrawlStarsApp:
         
         with tab1:
             # Display Star Powers
-            st.markdown("### Star Powers")
-            for star_power in brawler_details.get('starPowers', []):
-                st.markdown(f"""
-                    <div style='
-                        padding: 10px;
-                        border: 1px solid #ddd;
-                        border-radius: 5px;
-                        margin: 5px;
-                        background-color: rgba(255,255,255,0.05);
-                    '>
-                        <h4>{star_power['name']}</h4>
-                    </div>
-                """, unsafe_allow_html=True)
+            star_powers_html = _render_ability_cards(
+                star_power['name'] for star_power in brawler_details.get('starPowers', [])
+            )
+            st.markdown(f"### Star Powers\n\n{star_powers_html}", unsafe_allow_html=True)
             
             # Display Gadgets
-            st.markdown("### Gadgets")
-            for gadget in brawler_details.get('gadgets', []):
-                st.markdown(f"""
-                    <div style='
-                        padding: 10px;
-                        border: 1px solid #ddd;
-                        border-radius: 5px;
-                        margin: 5px;
-                        background-color: rgba(255,255,255,0.05);
-                    '>
-                        <h4>{gadget['name']}</h4>
-                    </div>
-                """, unsafe_allow_html=True)
+            gadgets_html = _render_ability_cards(
+                gadget['name'] for gadget in brawler_details.get('gadgets', [])
+            )
+            st.markdown(f"### Gadgets\n\n{gadgets_html}", unsafe_allow_html=True)
         
         with tab2:
             # Load and display ranking information
             rankings = self.api_client.get_brawler_rankings(brawler_id)
             if rankings and 'items' in rankings:
                 st.markdown("### Top 10 Players Global")
-                ranking_data = []
-                for idx, player in enumerate(rankings['items'][:10], 1):
-                    ranking_data.append({
-                        'Rank': idx,
-                        'Player': player['name'],
-                        'Trophies': player['trophies'],
-                        'Club': player.get('club', {}).get('name', 'No Club')
-                    })
+                top_players = rankings['items'][:10]
+                ranking_data = pd.DataFrame({
+                    'Rank': range(1, len(top_players) + 1),
+                    'Player': [player['name'] for player in top_players],
+                    'Trophies': [player['trophies'] for player in top_players],
+                    'Club': [player.get('club', {}).get('name', 'No Club') for player in top_players]
+                })
                 
                 st.dataframe(
                     ranking_data,
-                    column_config={
-                        'Rank': st.column_config.NumberColumn(format="%d"),
-                        'Trophies': st.column_config.NumberColumn(format="%d")
-                    },
+                    column_config=_RANKING_COLCFG,
                     hide_index=True
                 )
             else:
                 st.warning("No ranking data available")
 
     def _load_club_info(self) -> Dict:
-        """Loads information for all predefined clubs"""
-        club_info = {}
-        for name, tag in self.CLUB_TAGS.items():
-            club_data = self.api_client.get_club_info(tag)
-            if club_data:
-                club_info[name] = club_data
-        return club_info
+        """Loads information for all predefined clubs (requests run concurrently)"""
+        results = _run_parallel(*(
+            partial(self.api_client.get_club_info, tag) for tag in self.CLUB_TAGS.values()
+        ))
+        return {
+            name: club_data
+            for name, club_data in zip(self.CLUB_NAMES, results)
+            if club_data
+        }
 
     def _setup_player_selection(self, club_info: Dict) -> Tuple[Optional[str], Optional[str]]:
         """Creates the user interface for player selection"""
+        # Club options are shared by both columns (precomputed unless a club failed to load)
+        if len(club_info) == len(self.CLUB_NAMES):
+            club_names, default_club_index = self.CLUB_NAMES, self.DEFAULT_CLUB_INDEX
+        else:
+            club_names = tuple(club_info)
+            default_club_index = club_names.index("Venom Vipers") if "Venom Vipers" in club_info else 0
+
+        # Stays None when no club could be loaded and nothing is selected
+        player1_tag = player2_tag = None
         col1, col2 = st.columns(2)
 
         with col1:
@@ -332,16 +516,18 @@ class BrawlStarsApp:
             if selection_mode1 == "Select from Club":
                 club1 = st.selectbox(
                     "Select Club (Player 1)",
-                    options=list(club_info.keys()),
+                    options=club_names,
                     key="club1",
-                    index=list(club_info.keys()).index("Venom Vipers")
+                    index=default_club_index
                 )
                 if club1:
-                    members1 = self.api_client.get_club_members(self.CLUB_TAGS[club1])
-                    if members1:
-                        member_list1 = [f"{m['name']} ({m['tag']})" for m in members1['items']]
-                        default_index1 = next((i for i, m in enumerate(member_list1) 
-                                            if "Spoony" in m), 0)
+                    try:
+                        member_list1, name_to_idx1 = _load_member_options(self.api_client, self.CLUB_TAGS[club1])
+                    except ValueError:
+                        player1_tag = None
+                        st.error("Error loading club members")
+                    else:
+                        default_index1 = name_to_idx1.get("Spoony", 0)
                         player1 = st.selectbox(
                             "Select Player 1",
                             options=member_list1,
@@ -349,17 +535,15 @@ class BrawlStarsApp:
                             index=default_index1
                         )
                         player1_tag = player1.split('(')[1].rstrip(')') if player1 else None
-                    else:
-                        player1_tag = None
-                        st.error("Error loading club members")
             else:
                 player1_tag = st.text_input(
                     "Enter Player ID (with #)",
                     placeholder="#2YJQ8LRCG",
                     key="player1_direct"
                 )
-                if player1_tag and not player1_tag.startswith('#'):
-                    st.error("Player ID must start with #")
+                player1_tag = player1_tag.strip().upper()
+                if player1_tag and not _TAG_RE.match(player1_tag):
+                    st.error("Player ID must start with # followed by a valid player tag")
                     player1_tag = None
 
         with col2:
@@ -375,16 +559,18 @@ class BrawlStarsApp:
             if selection_mode2 == "Select from Club":
                 club2 = st.selectbox(
                     "Select Club (Player 2)",
-                    options=list(club_info.keys()),
+                    options=club_names,
                     key="club2",
-                    index=list(club_info.keys()).index("Venom Vipers")
+                    index=default_club_index
                 )
                 if club2:
-                    members2 = self.api_client.get_club_members(self.CLUB_TAGS[club2])
-                    if members2:
-                        member_list2 = [f"{m['name']} ({m['tag']})" for m in members2['items']]
-                        default_index2 = next((i for i, m in enumerate(member_list2) 
-                                            if "Creppy" in m), 0)
+                    try:
+                        member_list2, name_to_idx2 = _load_member_options(self.api_client, self.CLUB_TAGS[club2])
+                    except ValueError:
+                        player2_tag = None
+                        st.error("Error loading club members")
+                    else:
+                        default_index2 = name_to_idx2.get("Creppy", 0)
                         player2 = st.selectbox(
                             "Select Player 2",
                             options=member_list2,
@@ -392,52 +578,45 @@ class BrawlStarsApp:
                             index=default_index2
                         )
                         player2_tag = player2.split('(')[1].rstrip(')') if player2 else None
-                    else:
-                        player2_tag = None
-                        st.error("Error loading club members")
             else:
                 player2_tag = st.text_input(
                     "Enter Player ID (with #)",
                     placeholder="#2YJQ8LRCG",
                     key="player2_direct"
                 )
-                if player2_tag and not player2_tag.startswith('#'):
-                    st.error("Player ID must start with #")
+                player2_tag = player2_tag.strip().upper()
+                if player2_tag and not _TAG_RE.match(player2_tag):
+                    st.error("Player ID must start with # followed by a valid player tag")
                     player2_tag = None
 
-        # Validate player tags before returning
-        if player1_tag and player2_tag:
-            # Check if players exist
-            test_player1 = self.api_client.get_player_info(player1_tag)
-            test_player2 = self.api_client.get_player_info(player2_tag)
-            
-            if not test_player1:
-                st.error(f"Player 1 with tag {player1_tag} not found.")
-                return None, None
-            
-            if not test_player2:
-                st.error(f"Player 2 with tag {player2_tag} not found.")
-                return None, None
-
         return player1_tag, player2_tag
 
     def _display_player_comparison(self, player1_tag: str, player2_tag: str) -> None:
         """Shows the comparison between two players"""
-        # Load player data
-        player1_data = self.api_client.get_player_info(player1_tag)
-        player2_data = self.api_client.get_player_info(player2_tag)
+        # Load player data and battle logs of both players concurrently
+        (player1_data, battles1), (player2_data, battles2) = _run_parallel(
+            lambda: _get_player_bundle(self.api_client, player1_tag),
+            lambda: _get_player_bundle(self.api_client, player2_tag)
+        )
+
+        if not player1_data:
+            st.error(f"Player 1 with tag {player1_tag} not found.")
+            return
 
-        if not player1_data or not player2_data:
-            st.error("Error loading player data")
+        if not player2_data:
+            st.error(f"Player 2 with tag {player2_tag} not found.")
             return
 
-        # Load club information
-        club1_info = None
-        club2_info = None
-        if 'club' in player1_data and player1_data['club'].get('tag'):
-            club1_info = self.api_client.get_club_info(player1_data['club']['tag'])
-        if 'club' in player2_data and player2_data['club'].get('tag'):
-            club2_info = self.api_client.get_club_info(player2_data['club']['tag'])
+        # Load club information (depends on the club tags from the player data)
+        club1_tag = player1_data.get('club', {}).get('tag')
+        club2_tag = player2_data.get('club', {}).get('tag')
+        # Players of the same club share a single request
+        club_tags = list(dict.fromkeys(tag for tag in (club1_tag, club2_tag) if tag))
+        clubs = dict(zip(club_tags, _run_parallel(*(
+            partial(self.api_client.get_club_info, tag) for tag in club_tags
+        ))))
+        club1_info = clubs.get(club1_tag)
+        club2_info = clubs.get(club2_tag)
 
         # Display player statistics
         col1, col2 = st.columns(2)
@@ -446,31 +625,25 @@ class BrawlStarsApp:
 
         # Trophy comparison as bar chart with Plotly
         st.header("Trophy Comparison")
-        trophy_data = {
-            'Player': [player1_data['name'], player2_data['name']],
-            'Trophies': [player1_data['trophies'], player2_data['trophies']]
-        }
-        trophy_df = pd.DataFrame(trophy_data)
-        
-        # Create a Plotly bar chart with dark blue and dark red
-        fig = px.bar(
-            trophy_df,
-            x='Player',
-            y='Trophies',
-            color='Player',
-            color_discrete_map={
-                player1_data['name']: '#8B0000',  # Dark red for Player 1
-                player2_data['name']: '#00008B'   # Dark blue for Player 2
-            },
-            text='Trophies'
-        )
+        player_names = [player1_data['name'], player2_data['name']]
+        player_colors = ['#8B0000', '#00008B']  # Dark red for Player 1, dark blue for Player 2
+        trophies = [player1_data['trophies'], player2_data['trophies']]
+
+        # Two bars only, so the figure is built directly from the values
+        fig = go.Figure(go.Bar(
+            x=player_names,
+            y=trophies,
+            marker_color=player_colors,
+            text=trophies,
+            textposition='outside'  # Values above bars
+        ))
         
         # Adjust layout
-        fig.update_traces(textposition='outside')  # Values above bars
         fig.update_layout(
+            **_TRANSPARENT_LAYOUT,  # Transparent background, chart height
             showlegend=False,  # Hide legend
-            plot_bgcolor='rgba(0,0,0,0)',  # Transparent background
-            height=400  # Chart height
+            xaxis_title="Player",
+            yaxis_title="Trophies"
         )
         
         st.plotly_chart(fig, use_container_width=True)
@@ -479,43 +652,31 @@ class BrawlStarsApp:
         st.header("Victory Comparison")
         
         # Prepare data for different victory types
-        victories_data = {
-            'Player': [
-                player1_data['name'], player1_data['name'], player1_data['name'],
-                player2_data['name'], player2_data['name'], player2_data['name']
-            ],
-            'Victory Type': ['3vs3', 'Solo', 'Duo'] * 2,
-            'Count': [
-                player1_data.get('3vs3Victories', 0),
-                player1_data.get('soloVictories', 0),
-                player1_data.get('duoVictories', 0),
-                player2_data.get('3vs3Victories', 0),
-                player2_data.get('soloVictories', 0),
-                player2_data.get('duoVictories', 0)
-            ]
-        }
-        victories_df = pd.DataFrame(victories_data)
+        victory_counts = np.array([
+            [p.get('3vs3Victories', 0), p.get('soloVictories', 0), p.get('duoVictories', 0)]
+            for p in (player1_data, player2_data)
+        ])
+        victory_types = ['3vs3', 'Solo', 'Duo']
         
-        # Create a grouped bar chart for victories
-        fig_victories = px.bar(
-            victories_df,
-            x='Victory Type',
-            y='Count',
-            color='Player',
-            barmode='group',  # Grouped bars side by side
-            color_discrete_map={
-                player1_data['name']: '#8B0000',  # Dark red for Player 1
-                player2_data['name']: '#00008B'   # Dark blue for Player 2
-            },
-            text='Count'  # Show values above bars
-        )
+        # Create a grouped bar chart for victories (one trace per player)
+        fig_victories = go.Figure([
+            go.Bar(
+                name=name,
+                x=victory_types,
+                y=counts,
+                marker_color=color,
+                text=counts,
+                textposition='outside'  # Show values above bars
+            )
+            for name, counts, color in zip(player_names, victory_counts, player_colors)
+        ])
         
         # Adjust layout
-        fig_victories.update_traces(textposition='outside')
         fig_victories.update_layout(
+            barmode='group',  # Grouped bars side by side
             showlegend=True,  # Show legend for better distinction
-            plot_bgcolor='rgba(0,0,0,0)',
-            height=400,
+            legend_title_text='Player',
+            **_TRANSPARENT_LAYOUT,
             xaxis_title="Game Mode",
             yaxis_title="Number of Victories"
         )
@@ -544,43 +705,18 @@ class BrawlStarsApp:
         self.ui.display_brawler_details(brawler_details2, detail_col2)
 
         # Display battle logs
-        battles1 = self.api_client.get_battle_log(player1_tag)
-        battles2 = self.api_client.get_battle_log(player2_tag)
-        
         if battles1 and battles2:
-            self._display_battle_logs(battles1, battles2, player1_tag, player2_tag)
+            # Format battle logs once for the charts, tables and AI analysis
+            battle_log1 = self.data_processor.summarize_battle_log(battles1, player1_data['tag'])
+            battle_log2 = self.data_processor.summarize_battle_log(battles2, player2_data['tag'])
+
+            self._display_battle_logs(battle_log1, battle_log2, player1_data, player2_data)
             
-            # Add AI analysis button
-            st.header("AI Analysis")
-            if st.button("Generate AI Analysis"):
-                with st.spinner("Generating analysis..."):
-                    # Calculate statistics for analysis
-                    formatted_battles1, star_count1 = self.data_processor.format_battle_log(battles1, player1_tag)
-                    formatted_battles2, star_count2 = self.data_processor.format_battle_log(battles2, player2_tag)
-                    battle_stats1 = self.data_processor.calculate_battle_statistics(formatted_battles1)
-                    battle_stats2 = self.data_processor.calculate_battle_statistics(formatted_battles2)
-                    
-                    # Generate AI analysis
-                    analysis = self._generate_ai_comparison(
-                        player1_data, player2_data,
-                        brawler_stats1, brawler_stats2,
-                        battle_stats1, battle_stats2,
-                        star_count1, star_count2
-                    )
-                    
-                    # Display analysis in a nice container
-                    st.markdown("""
-                        <style>
-                            .analysis-container {
-                                padding: 20px;
-                                border-radius: 10px;
-                                background-color: rgba(255, 255, 255, 0.05);
-                                margin: 10px 0;
-                            }
-                        </style>
-                    """, unsafe_allow_html=True)
-                    
-                    st.markdown(f'<div class="analysis-container">{analysis}</div>', unsafe_allow_html=True)
+            self._display_ai_analysis(
+                player1_data, player2_data,
+                brawler_stats1, brawler_stats2,
+                battle_log1, battle_log2
+            )
 
         # Add Buy Me a Coffee info after AI analysis
         st.markdown(
@@ -593,90 +729,94 @@ class BrawlStarsApp:
             unsafe_allow_html=True
         )
 
-    def _display_battle_logs(self, battles1, battles2, player1_tag, player2_tag):
-        """Displays battle logs for both players side by side"""
-        player1_name = self._get_player_name(player1_tag)
-        player2_name = self._get_player_name(player2_tag)
+    @st.fragment
+    def _display_ai_analysis(self, player1_data: Dict, player2_data: Dict,
+                             brawler_stats1: Dict, brawler_stats2: Dict,
+                             battle_log1: Dict, battle_log2: Dict) -> None:
+        """Shows the AI analysis section (reruns on its own when the button is pressed)"""
+        st.header("AI Analysis")
+        if st.button("Generate AI Analysis"):
+            # Display analysis in a nice container
+            st.markdown("""
+                <style>
+                    .analysis-container {
+                        padding: 20px;
+                        border-radius: 10px;
+                        background-color: rgba(255, 255, 255, 0.05);
+                        margin: 10px 0;
+                    }
+                </style>
+            """, unsafe_allow_html=True)
 
-        # Ensure variables exist even if battle logs are missing
-        formatted_battles1 = []
-        formatted_battles2 = []
-        star_count1 = 0
-        star_count2 = 0
+            # Render the analysis token by token as it is generated
+            placeholder = st.empty()
+            analysis = ""
+            with st.spinner("Generating analysis..."):
+                for token in self._generate_ai_comparison(
+                    player1_data, player2_data,
+                    brawler_stats1, brawler_stats2,
+                    battle_log1['statistics'], battle_log2['statistics'],
+                    battle_log1['star_count'], battle_log2['star_count']
+                ):
+                    analysis += token
+                    placeholder.markdown(f'<div class="analysis-container">{analysis}</div>', unsafe_allow_html=True)
+
+    def _display_battle_logs(self, battle_log1: Dict, battle_log2: Dict,
+                             player1_data: Dict, player2_data: Dict) -> None:
+        """Displays battle logs for both players side by side"""
+        player1_tag, player1_name = player1_data['tag'], player1_data['name']
+        player2_tag, player2_name = player2_data['tag'], player2_data['name']
+        formatted_battles1 = battle_log1['battles']
+        formatted_battles2 = battle_log2['battles']
 
         # Trophy Progress Chart
         st.write("### Trophy Progression in Recent Games")
-        if not battles1 or not battles2:
-            st.info("Battle logs not available for one or both players.")
-        if battles1 and battles2:
-            # Process battle data for player 1
-            formatted_battles1, star_count1 = self.data_processor.format_battle_log(battles1, player1_tag)
-            df1 = pd.DataFrame(formatted_battles1)
-            df1['Trophy_Change'] = pd.to_numeric(df1['Trophy Change'], errors='coerce').fillna(0)
-            df1['Cumulative_Trophies'] = df1['Trophy_Change'].cumsum()
-            
-            # Process battle data for player 2
-            formatted_battles2, star_count2 = self.data_processor.format_battle_log(battles2, player2_tag)
-            df2 = pd.DataFrame(formatted_battles2)
-            df2['Trophy_Change'] = pd.to_numeric(df2['Trophy Change'], errors='coerce').fillna(0)
-            df2['Cumulative_Trophies'] = df2['Trophy_Change'].cumsum()
+        if formatted_battles1 and formatted_battles2:
+            # Cumulative trophy change over the recent games of each player
+            trophies1 = np.cumsum(battle_log1['trophy_changes'])
+            trophies2 = np.cumsum(battle_log2['trophy_changes'])
             
-            # Create comparison data
-            chart_data = pd.DataFrame({
-                player1_name: df1['Cumulative_Trophies'].values,
-                player2_name: df2['Cumulative_Trophies'].values
-            })
+            # Create comparison data (pandas pads the shorter log with NaN)
+            chart_data = pd.concat([
+                pd.Series(trophies1, name=player1_name),
+                pd.Series(trophies2, name=player2_name)
+            ], axis=1)
+            chart_data.index = pd.RangeIndex(1, len(chart_data) + 1, name='Game')
             
             # Use native Streamlit line chart
             st.line_chart(
                 chart_data,
                 height=300
             )
+        else:
+            st.info("Battle logs not available for one or both players.")
         
         # Display battle logs in columns
         col1, col2 = st.columns(2)
         
         with col1:
             if formatted_battles1:
-                stats1 = self.data_processor.calculate_battle_statistics(formatted_battles1)
+                stats1 = battle_log1['statistics']
                 st.metric("Victories", f"{stats1['victories']}/{stats1['total_games']}")
                 st.metric("Win Rate", f"{stats1['win_rate']:.1f}%")
-                st.metric("Star Player", f"{star_count1}x ⭐")
+                st.metric("Star Player", f"{battle_log1['star_count']}x ⭐")
                 
                 # Show link to extended statistics if available
                 if self.data_processor.has_extended_statistics(player1_tag):
-                    st.markdown(
-                        f"""
-                        <div style='text-align: center; padding: 10px;'>
-                            <a href="?page=extended_stats&player_tag={player1_tag.replace('#', '%23')}" target="_self">
-                                📊 Advanced Battle Statistics available
-                            </a>
-                        </div>
-                        """,
-                        unsafe_allow_html=True
-                    )
-                st.dataframe(pd.DataFrame(formatted_battles1))
+                    st.markdown(_extended_stats_link(player1_tag), unsafe_allow_html=True)
+                st.dataframe(battle_log1['table'])
                 
         with col2:
             if formatted_battles2:
-                stats2 = self.data_processor.calculate_battle_statistics(formatted_battles2)
+                stats2 = battle_log2['statistics']
                 st.metric("Victories", f"{stats2['victories']}/{stats2['total_games']}")
                 st.metric("Win Rate", f"{stats2['win_rate']:.1f}%")
-                st.metric("Star Player", f"{star_count2}x ⭐")
+                st.metric("Star Player", f"{battle_log2['star_count']}x ⭐")
                 
                 # Show link to extended statistics if available
                 if self.data_processor.has_extended_statistics(player2_tag):
-                    st.markdown(
-                        f"""
-                        <div style='text-align: center; padding: 10px;'>
-                            <a href="?page=extended_stats&player_tag={player2_tag.replace('#', '%23')}" target="_self">
-                                📊 Advanced Battle Statistics available
-                            </a>
-                        </div>
-                        """,
-                        unsafe_allow_html=True
-                    )
-                st.dataframe(pd.DataFrame(formatted_battles2))
+                    st.markdown(_extended_stats_link(player2_tag), unsafe_allow_html=True)
+                st.dataframe(battle_log2['table'])
 
     def _show_clubs_page(self) -> None:
         """Shows the club analysis page"""
@@ -688,7 +828,7 @@ class BrawlStarsApp:
         with tab1:
             selected_club = st.selectbox(
                 "Select Club",
-                options=list(self.CLUB_TAGS.keys())
+                options=self.CLUB_NAMES
             )
             if selected_club:
                 club_tag = self.CLUB_TAGS[selected_club]
@@ -759,102 +899,65 @@ class BrawlStarsApp:
         st.markdown("### Members")
         
         if 'members' in club_info:
-            # Create DataFrame for members
-            members_data = []
-            for member in club_info['members']:
-                members_data.append({
-                    'Name': member['name'],
-                    'Role': member['role'].capitalize(),
-                    'Trophies': member['trophies'],
-                    'Tag': member['tag']
-                })
-            
-            df = pd.DataFrame(members_data)
-            
-            # Sort by trophies descending
-            df = df.sort_values('Trophies', ascending=False)
+            # Build the member columns (a plain dict is enough for st.dataframe), sorted by trophies descending
+            members = club_info['members']
+            trophies = np.fromiter((member['trophies'] for member in members), dtype=np.int32, count=len(members))
+            order = np.argsort(-trophies, kind='stable')
+            roles = [members[i]['role'].capitalize() for i in order]
+            members_table = {
+                'Name': [members[i]['name'] for i in order],
+                'Role': roles,
+                'Trophies': trophies[order],
+                'Tag': [members[i]['tag'] for i in order]
+            }
             
             # Show table with adjusted styling
             st.dataframe(
-                df,
-                column_config={
-                    'Name': st.column_config.TextColumn('Name'),
-                    'Role': st.column_config.TextColumn('Role'),
-                    'Trophies': st.column_config.NumberColumn('Trophies', format="%d"),
-                    'Tag': st.column_config.TextColumn('Tag')
-                },
+                members_table,
+                column_config=_MEMBERS_COLCFG,
                 hide_index=True
             )
 
             # Trophy distribution as histogram
             st.markdown("### Trophy Distribution")
-            fig = px.histogram(
-                df,
-                x='Trophies',
-                nbins=20,
-                title='Distribution of Member Trophies'
-            )
+            # Bin on the server so only the 20 bin counts are sent to the browser
+            counts, edges = np.histogram(trophies, bins=20)
+            fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges)))
             fig.update_layout(
+                bargap=0,
+                title='Distribution of Member Trophies',
+                xaxis_title='Trophies',
+                yaxis_title='count',
                 showlegend=False,
-                plot_bgcolor='rgba(0,0,0,0)',
-                height=400
+                **_TRANSPARENT_LAYOUT
             )
             st.plotly_chart(fig, use_container_width=True)
 
             # Role distribution as pie chart
             st.markdown("### Role Distribution")
-            role_counts = df['Role'].value_counts()
-            fig_roles = px.pie(
-                values=role_counts.values,
-                names=role_counts.index,
-                title='Distribution of Club Roles'
-            )
-            fig_roles.update_layout(height=400)
+            role_labels, role_counts = zip(*Counter(roles).most_common()) if roles else ((), ())
+            fig_roles = go.Figure(go.Pie(values=role_counts, labels=role_labels))
+            fig_roles.update_layout(title='Distribution of Club Roles', height=400)
             st.plotly_chart(fig_roles, use_container_width=True)
 
     def _generate_ai_comparison(self, player1_data: Dict, player2_data: Dict,
                               brawler_stats1: Dict, brawler_stats2: Dict,
                               battle_stats1: Dict, battle_stats2: Dict,
-                              star_count1: int, star_count2: int) -> str:
-        """Generates an AI-based analysis of the player comparison"""
+                              star_count1: int, star_count2: int) -> Iterator[str]:
+        """Generates an AI-based analysis of the player comparison, streamed token by token"""
         
-        prompt = f"""
-        Compare these two Brawl Stars players based on their statistics:
-
-        Player 1 ({player1_data['name']}):
-        - Highest Trophies: {player1_data['highestTrophies']}
-        - 3vs3 Victories: {player1_data.get('3vs3Victories', 0)}
-        - Solo Victories: {player1_data.get('soloVictories', 0)}
-        - Duo Victories: {player1_data.get('duoVictories', 0)}
-        - Club Trophies: {player1_data.get('club', {}).get('trophies', 0)}
-        - Total Brawlers: {brawler_stats1.get('total_brawlers', 0)}
-        - Brawlers Power 9+: {brawler_stats1.get('high_level_brawlers', 0)}
-        - Brawlers Power 11: {brawler_stats1.get('max_level_brawlers', 0)}
-        - Recent Win Rate: {battle_stats1.get('win_rate', 0):.1f}%
-        - Star Player Count: {star_count1}
-
-        Player 2 ({player2_data['name']}):
-        - Highest Trophies: {player2_data['highestTrophies']}
-        - 3vs3 Victories: {player2_data.get('3vs3Victories', 0)}
-        - Solo Victories: {player2_data.get('soloVictories', 0)}
-        - Duo Victories: {player2_data.get('duoVictories', 0)}
-        - Club Trophies: {player2_data.get('club', {}).get('trophies', 0)}
-        - Total Brawlers: {brawler_stats2.get('total_brawlers', 0)}
-        - Brawlers Power 9+: {brawler_stats2.get('high_level_brawlers', 0)}
-        - Brawlers Power 11: {brawler_stats2.get('max_level_brawlers', 0)}
-        - Recent Win Rate: {battle_stats2.get('win_rate', 0):.1f}%
-        - Star Player Count: {star_count2}
-
-        Create a concise analysis, in maximum 6-8 sentences, comparing these players.
-        Highlight key differences and mention who is stronger in which areas.
-        Just one paragraph in response.
-        Classify the players based on their trophy count using this scale: Beginner (0 to 700), Novice (701 to 3,000), Intermediate (3,001 to 10,000), Proficient (10,001 to 20,000), Advanced (20,001 to 50,000), Expert (50,001+).
-        Focus on the most significant stats that show the skill and progress level of each player.
-        """
+        prompt = _AI_PROMPT_TEMPLATE.format(
+            player1=self._format_ai_player_block(player1_data, brawler_stats1, battle_stats1, star_count1),
+            player2=self._format_ai_player_block(player2_data, brawler_stats2, battle_stats2, star_count2)
+        )
 
         try:
-            # Using Together AI's completion endpoint
-            response = together.Complete.create(
+            # Imported lazily, only this button needs Together AI
+            import together
+            together.api_key = self.together_api_key
+
+            # Using Together AI's streaming completion endpoint
+            tokens = together.Complete.create_streaming(
                 prompt=f"<human>You are a Brawl Stars expert. {prompt}</human><assistant>",
                 model="mistralai/Mixtral-8x7B-Instruct-v0.1",
                 temperature=0.3,
@@ -863,38 +966,53 @@ class BrawlStarsApp:
                 top_p=0.5,
                 repetition_penalty=1.1
             )
-            
-            # Debug logging
-            logging.info(f"AI Response: {response}")
-            
-            # Extract the generated text from the response
-            if isinstance(response, dict):
-                # Navigate through the response structure
-                if 'output' in response and 'choices' in response['output']:
-                    choices = response['output']['choices']
-                    if choices and len(choices) > 0 and 'text' in choices[0]:
-                        return choices[0]['text'].strip()
-            
-            logging.error(f"Unexpected response structure: {response}")
-            return "Error: Could not extract analysis from AI response"
-            
+
+            analysis = []
+            for token in tokens:
+                # Drop leading whitespace of the completion
+                if not analysis:
+                    token = token.lstrip()
+                    if not token:
+                        continue
+                analysis.append(token)
+                yield token
+
+            # Debug logging (the response is only joined when INFO is enabled)
+            if logging.getLogger().isEnabledFor(logging.INFO):
+                logging.info("AI Response: %s", "".join(analysis))
+
+            if not analysis:
+                logging.error("Empty response from AI stream")
+                yield "Error: Could not extract analysis from AI response"
+
         except Exception as e:
             error_msg = f"Error generating AI analysis: {str(e)}"
             logging.error(error_msg)
-            return error_msg
+            yield error_msg
+
+    @staticmethod
+    def _format_ai_player_block(player_data: Dict, brawler_stats: Dict,
+                                battle_stats: Dict, star_count: int) -> str:
+        """Fills the prompt block of one player for the AI comparison"""
+        return _AI_PLAYER_TEMPLATE.format(
+            name=player_data['name'],
+            highest_trophies=player_data['highestTrophies'],
+            victories_3vs3=player_data.get('3vs3Victories', 0),
+            solo_victories=player_data.get('soloVictories', 0),
+            duo_victories=player_data.get('duoVictories', 0),
+            club_trophies=player_data.get('club', {}).get('trophies', 0),
+            total_brawlers=brawler_stats.get('total_brawlers', 0),
+            high_level_brawlers=brawler_stats.get('high_level_brawlers', 0),
+            max_level_brawlers=brawler_stats.get('max_level_brawlers', 0),
+            win_rate=battle_stats.get('win_rate', 0),
+            star_count=star_count
+        )
 
     def _load_brawler_tips(self, brawler_name: str) -> Dict:
         """Lädt die Tips für einen bestimmten Brawler aus der JSON-Datei"""
         try:
-            with open('BrawlerTips.json', 'r', encoding='utf-8') as f:
-                tips_data = json.load(f)
-                
-            # Suche den Brawler in den Tips (case-insensitive)
-            for brawler in tips_data['brawlers']:
-                if brawler['brawlerName'].lower() == brawler_name.lower():
-                    return brawler['tips']
-                    
-            return {} # Leeres Dict falls Brawler nicht gefunden
+            # Case-insensitive lookup, empty dict if the brawler has no tips
+            return _load_tips_index().get(brawler_name.lower(), {})
         except Exception as e:
             logging.error(f"Error loading brawler tips: {e}")
             return {}
@@ -934,71 +1052,64 @@ class BrawlStarsApp:
         start_datetime = f"{start_date}T00:00:00" if start_date else None
         end_datetime = f"{end_date}T23:59:59" if end_date else None
         
-        # Fetch and display extended statistics
-        stats = self.data_processor.get_extended_statistics(
-            player_tag,
-            start_date=start_datetime,
-            end_date=end_datetime
-        )
+        # Fetch all statistics concurrently (independent requests to the custom API)
+        stats, progress_data, brawler_data, gamemode_data, map_data = _run_parallel(*(
+            partial(fetch, player_tag, start_date=start_datetime, end_date=end_datetime)
+            for fetch in (
+                self.data_processor.get_extended_statistics,
+                self.data_processor.get_trophy_progress,
+                self.data_processor.get_brawler_statistics,
+                self.data_processor.get_gamemode_statistics,
+                self.data_processor.get_map_statistics
+            )
+        ))
+
+        # Display extended statistics
         if stats:
-            # Time Range
-            st.write("### 📅 Time Range")
-            col1, col2 = st.columns(2)
-            with col1:
-                st.metric("First Battle", stats.get("first_battle", "Unknown"))
-            with col2:
-                st.metric("Last Battle", stats.get("last_battle", "Unknown"))
-            
-            st.markdown("---")  # Trennlinie
+            total_victories = int(stats.get('total_battles', 0) * stats.get('win_rate', 0) / 100)
             
-            # Battle Statistics
-            st.write("### 🎮 Battle Statistics")
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Total Battles", f"{stats.get('total_battles', 0):,}")
-            with col2:
-                total_victories = int(stats.get('total_battles', 0) * stats.get('win_rate', 0) / 100)
-                st.metric("Total Victories", f"{total_victories:,}")
-            with col3:
-                st.metric("Win Rate", f"{stats.get('win_rate', 0):.1f}%")
-            
-            st.markdown("---")  # Trennlinie
-            
-            # Daily Averages
-            st.write("### 📈 Daily Averages")
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Battles/Day", f"{stats.get('avg_battles_per_day', 0):.1f}")
-            with col2:
-                st.metric("Victories/Day", f"{stats.get('avg_victories_per_day', 0):.1f}")
-            with col3:
-                st.metric("Trophies/Day", f"{stats.get('avg_trophies_per_day', 0):.1f}")
-                
-            st.markdown("---")  # Trennlinie
+            # Time range, battle statistics and daily averages as one HTML block
+            st.markdown(
+                "\n\n---\n\n".join([
+                    _render_metric_section("📅 Time Range", [
+                        ("First Battle", stats.get("first_battle", "Unknown")),
+                        ("Last Battle", stats.get("last_battle", "Unknown"))
+                    ]),
+                    _render_metric_section("🎮 Battle Statistics", [
+                        ("Total Battles", f"{stats.get('total_battles', 0):,}"),
+                        ("Total Victories", f"{total_victories:,}"),
+                        ("Win Rate", f"{stats.get('win_rate', 0):.1f}%")
+                    ]),
+                    _render_metric_section("📈 Daily Averages", [
+                        ("Battles/Day", f"{stats.get('avg_battles_per_day', 0):.1f}"),
+                        ("Victories/Day", f"{stats.get('avg_victories_per_day', 0):.1f}"),
+                        ("Trophies/Day", f"{stats.get('avg_trophies_per_day', 0):.1f}")
+                    ])
+                ]) + "\n\n---",
+                unsafe_allow_html=True
+            )
             
             # Trophy Progress Chart
             st.write("### 🏆 Trophy Progress")
-            progress_data = self.data_processor.get_trophy_progress(
-                player_tag,
-                start_date=start_datetime,
-                end_date=end_datetime
-            )
-            
             if progress_data and 'daily_progress' in progress_data:
-                # Convert data to DataFrame
-                df = pd.DataFrame(progress_data['daily_progress'])
-                df['date'] = pd.to_datetime(df['date']).dt.date
+                daily_progress = progress_data['daily_progress']
                 
                 # Calculate cumulative trophy progress
-                df['cumulative_trophies'] = df['trophy_change'].cumsum()
+                trophy_changes = np.fromiter(
+                    (day['trophy_change'] for day in daily_progress),
+                    dtype=np.int32,
+                    count=len(daily_progress)
+                )
+                chart_data = pd.DataFrame(
+                    {'cumulative_trophies': np.cumsum(trophy_changes)},
+                    index=pd.Index(
+                        pd.to_datetime([day['date'] for day in daily_progress]).values.astype('datetime64[D]'),
+                        name='date'
+                    )
+                )
                 
                 # Create cumulative trophy progress chart
-                st.line_chart(
-                    df,
-                    x='date',
-                    y='cumulative_trophies',
-                    height=400
-                )
+                st.line_chart(chart_data, height=400)
                 
                 # Show total progress
                 st.metric(
@@ -1012,59 +1123,50 @@ class BrawlStarsApp:
         
         # Brawler Statistics
         st.write("### 🤖 Brawler Statistics")
-        brawler_data = self.data_processor.get_brawler_statistics(
-            player_tag,
-            start_date=start_datetime,
-            end_date=end_datetime
-        )
-        
         if brawler_data and 'brawler_statistics' in brawler_data:
             # Convert to DataFrame and sort by battles
-            df = pd.DataFrame(brawler_data['brawler_statistics'])
-            df = df.sort_values('battles', ascending=False)
+            df = pd.json_normalize(brawler_data['brawler_statistics'], sep='_').astype(_STAT_DTYPES)
+            df.sort_values('battles', ascending=False, kind='mergesort', inplace=True, ignore_index=True)
             
             # Display as interactive table
             st.dataframe(
                 df,
-                column_config={
-                    "brawler_name": st.column_config.TextColumn("Brawler", width="medium"),
-                    "battles": st.column_config.NumberColumn("Battles", width="small"),
-                    "victories": st.column_config.NumberColumn("Victories", width="small"),
-                    "trophy_change": st.column_config.NumberColumn("Trophy Δ", width="small"),
-                    "win_rate": st.column_config.NumberColumn("Win Rate", width="small", format="%.1f%%")
-                },
+                column_config=_BRAWLER_STATS_COLCFG,
                 hide_index=True,
                 use_container_width=True
             )
             
             # Add scatter plot for Brawler Performance
             st.write("#### Brawler Performance Analysis")
-            fig = px.scatter(
-                df,
-                x='battles',
-                y='win_rate',
-                color='trophy_change',
-                size='victories',
-                hover_name='brawler_name',
-                hover_data={
-                    'brawler_name': False,  # Hide brawler_name (shown in hover_name)
-                    'battles': True,
-                    'win_rate': ':.1f',
-                    'trophy_change': True,
-                    'victories': True
-                },
-                height=400,
-                labels={
-                    'battles': 'Total Battles',
-                    'win_rate': 'Win Rate (%)',
-                    'trophy_change': 'Trophy Change',
-                    'victories': 'Victories'
-                }
-            )
+            max_victories = df['victories'].max()
+            fig = go.Figure(go.Scatter(
+                x=df['battles'],
+                y=df['win_rate'],
+                mode='markers',
+                marker=dict(
+                    color=df['trophy_change'],
+                    colorbar=dict(title='Trophy Change'),
+                    size=df['victories'],
+                    sizemode='area',
+                    sizeref=2 * max_victories / 20 ** 2 if max_victories > 0 else 1,  # Largest marker 20px
+                    line_width=0
+                ),
+                text=df['brawler_name'],
+                customdata=df[['trophy_change', 'victories']],
+                hovertemplate=(
+                    "<b>%{text}</b><br><br>"
+                    "Total Battles=%{x}<br>"
+                    "Win Rate (%)=%{y:.1f}<br>"
+                    "Trophy Change=%{customdata[0]}<br>"
+                    "Victories=%{customdata[1]}<extra></extra>"
+                )
+            ))
             
             # Update layout for better appearance
             fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
+                **_TRANSPARENT_LAYOUT,
+                xaxis_title='Total Battles',
+                yaxis_title='Win Rate (%)',
                 hoverlabel=dict(bgcolor="white", font_size=14)
             )
             
@@ -1074,16 +1176,10 @@ class BrawlStarsApp:
         
         # Game Mode Statistics
         st.write("### 🎮 Game Mode Statistics")
-        gamemode_data = self.data_processor.get_gamemode_statistics(
-            player_tag,
-            start_date=start_datetime,
-            end_date=end_datetime
-        )
-        
         if gamemode_data and 'game_mode_statistics' in gamemode_data:
             # Convert to DataFrame and sort by battles
-            df = pd.DataFrame(gamemode_data['game_mode_statistics'])
-            df = df.sort_values('battles', ascending=False)
+            df = pd.json_normalize(gamemode_data['game_mode_statistics'], sep='_').astype(_STAT_DTYPES)
+            df.sort_values('battles', ascending=False, kind='mergesort', inplace=True, ignore_index=True)
             
             # Format battle_mode names for better readability
             df['battle_mode'] = df['battle_mode'].apply(lambda x: ' '.join(
@@ -1093,16 +1189,7 @@ class BrawlStarsApp:
             # Display as interactive table
             st.dataframe(
                 df,
-                column_config={
-                    "battle_mode": st.column_config.TextColumn("Game Mode", width="medium"),
-                    "battles": st.column_config.NumberColumn("Battles", width="small"),
-                    "victories": st.column_config.NumberColumn("Victories", width="small"),
-                    "trophy_change": st.column_config.NumberColumn("Trophy Δ", width="small"),
-                    "win_rate": st.column_config.NumberColumn("Win Rate", width="small", format="%.1f%%"),
-                    "avg_duration": st.column_config.NumberColumn("Avg Duration", width="small", format="%.1f s"),
-                    "avg_trophies_per_battle": st.column_config.NumberColumn("Trophies/Battle", width="small", format="%.2f"),
-                    "seconds_per_trophy": st.column_config.NumberColumn("Seconds/Trophy", width="small", format="%.1f")
-                },
+                column_config=_GAMEMODE_COLCFG,
                 hide_index=True,
                 use_container_width=True
             )
@@ -1114,23 +1201,19 @@ class BrawlStarsApp:
             df_filtered = df[df['battles'] >= 10].copy()
             
             # Create Plotly grouped bar chart
-            fig = px.bar(
-                df_filtered,
-                x='battle_mode',
-                y=['battles', 'victories'],
-                barmode='group',
-                height=400,
-                labels={
-                    'battle_mode': 'Game Mode',
-                    'value': 'Count',
-                    'variable': 'Type'
-                }
-            )
+            fig = go.Figure([
+                go.Bar(name=column, x=df_filtered['battle_mode'], y=df_filtered[column])
+                for column in ('battles', 'victories')
+            ])
             
             # Rotate x-axis labels for better readability
             fig.update_layout(
+                **_TRANSPARENT_LAYOUT,
+                barmode='group',
+                xaxis_title='Game Mode',
+                yaxis_title='Count',
+                legend_title_text='Type',
                 xaxis_tickangle=-45,
-                plot_bgcolor='rgba(0,0,0,0)',
                 showlegend=True
             )
             
@@ -1140,42 +1223,28 @@ class BrawlStarsApp:
         
         # Map Statistics
         st.write("### 🗺️ Map Statistics")
-        map_data = self.data_processor.get_map_statistics(
-            player_tag,
-            start_date=start_datetime,
-            end_date=end_datetime
-        )
-        
         if map_data and 'map_statistics' in map_data:
             # Convert to DataFrame and sort by battles
-            df = pd.DataFrame(map_data['map_statistics'])
-            df = df.sort_values('battles', ascending=False)
+            df = pd.json_normalize(map_data['map_statistics'], sep='_').astype(_STAT_DTYPES)
+            df.sort_values('battles', ascending=False, kind='mergesort', inplace=True, ignore_index=True)
             
-            # Create compact most played brawler info
-            df['most_played'] = df['most_played_brawler'].apply(
-                lambda x: f"{x['brawler_name']} ({x['battles']})"
+            # Create compact most played brawler info (nested dicts are flattened by json_normalize)
+            df['most_played'] = (
+                df['most_played_brawler_brawler_name'] + ' ('
+                + df['most_played_brawler_battles'].astype(str) + ')'
             )
             
-            # Create compact most trophies brawler info
-            df['most_trophies'] = df['most_trophy_brawler'].apply(
-                lambda x: f"{x['brawler_name']} ({x['trophy_change']:+})"
+            # Create compact most trophies brawler info (signed trophy change)
+            trophy_change = df['most_trophy_brawler_trophy_change']
+            df['most_trophies'] = (
+                df['most_trophy_brawler_brawler_name'] + ' ('
+                + np.where(trophy_change >= 0, '+', '') + trophy_change.astype(str) + ')'
             )
             
             # Display as interactive table
             st.dataframe(
                 df,
-                column_config={
-                    "event_map": st.column_config.TextColumn("Map", width="medium"),
-                    "battle_mode": st.column_config.TextColumn("Mode", width="small"),
-                    "battles": st.column_config.NumberColumn("Battles", width="small"),
-                    "victories": st.column_config.NumberColumn("Victories", width="small"),
-                    "trophy_change": st.column_config.NumberColumn("Trophy Δ", width="small"),
-                    "win_rate": st.column_config.NumberColumn("Win Rate", width="small", format="%.1f%%"),
-                    "avg_duration": st.column_config.NumberColumn("Avg Duration", width="small", format="%.1f s"),
-                    "avg_trophies_per_battle": st.column_config.NumberColumn("Trophies/Battle", width="small", format="%.2f"),
-                    "most_played": st.column_config.TextColumn("Most Played", width="small"),
-                    "most_trophies": st.column_config.TextColumn("Most Trophies By", width="small")
-                },
+                column_config=_MAP_COLCFG,
                 column_order=[
                     "event_map", "battle_mode", "battles", "victories", "trophy_change",
                     "win_rate", "avg_duration", "avg_trophies_per_battle", "most_played", "most_trophies"
@@ -1184,11 +1253,6 @@ class BrawlStarsApp:
                 use_container_width=True
             )
 
-    def _get_player_name(self, player_tag: str) -> str:
-        """Gets the player name from player tag"""
-        player_data = self.api_client.get_player_info(player_tag)
-        return player_data['name'] if player_data else "Unknown Player"
-
 def main():
     """Hauptfunktion zum Starten der App"""
     app = BrawlStarsApp()
@@ -1,8 +1,99 @@
+import html
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import numpy as np
 import plotly.graph_objects as go
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
+
+# Metric grid mimicking st.metric, rendered as plain HTML (one element instead of one per metric)
+_METRIC_HTML = (
+    "<div><div style='font-size: 14px; opacity: 0.7;'>{label}</div>"
+    "<div style='font-size: 2.25rem; line-height: 1.4;'>{value}</div></div>"
+)
+_METRIC_GRID_HTML = "<div style='display: grid; grid-template-columns: repeat({columns}, 1fr); gap: 1rem;'>{metrics}</div>"
+
+def metric_grid_html(metrics: List[Tuple[str, Any]], columns: int) -> str:
+    """
+    Renders label/value pairs as an HTML grid of metrics, filled row by row.
+
+    Args:
+        metrics (List[Tuple[str, Any]]): Label and value of each metric
+        columns (int): Number of grid columns
+
+    Returns:
+        str: HTML to pass to st.markdown with unsafe_allow_html=True
+    """
+    return _METRIC_GRID_HTML.format(
+        columns=columns,
+        metrics="".join(_METRIC_HTML.format(label=label, value=html.escape(str(value))) for label, value in metrics)
+    )
+
+# Figure builders are cached on their scalar inputs, so reruns reuse the built figure.
+# The shared layout is not hashed (leading underscore), it is the same for the whole process,
+# and each figure gets its final layout in the constructor.
+
+@st.cache_data(ttl=3600, max_entries=100)
+def _build_trophy_fig(name1: str, trophies1: int, highest1: int,
+                      name2: str, trophies2: int, highest2: int,
+                      _layout: go.Layout) -> go.Figure:
+    """Builds the grouped bar chart comparing current and highest trophies"""
+    metrics = ['Current Trophies', 'Highest Trophies']
+    return go.Figure(
+        data=[
+            go.Bar(name=name1, x=metrics, y=[trophies1, highest1]),
+            go.Bar(name=name2, x=metrics, y=[trophies2, highest2])
+        ],
+        layout=go.Layout(
+            _layout,
+            barmode='group',
+            title='Trophy Comparison',
+            xaxis_title="",
+            yaxis_title="Trophies",
+            legend_title="Player"
+        )
+    )
+
+@st.cache_data(ttl=3600, max_entries=100)
+def _build_victories_fig(name1: str, trio1: int, solo1: int, duo1: int,
+                         name2: str, trio2: int, solo2: int, duo2: int,
+                         _layout: go.Layout) -> go.Figure:
+    """Builds the grouped bar chart comparing the victories per game mode"""
+    modes = ['3v3', 'Solo', 'Duo']
+    return go.Figure(
+        data=[
+            go.Bar(name=name1, x=modes, y=[trio1, solo1, duo1]),
+            go.Bar(name=name2, x=modes, y=[trio2, solo2, duo2])
+        ],
+        layout=go.Layout(
+            _layout,
+            barmode='group',
+            title='Victory Comparison',
+            xaxis_title="Game Mode",
+            yaxis_title="Number of Victories",
+            legend_title="Player"
+        )
+    )
+
+@st.cache_data(ttl=3600, max_entries=100)
+def _build_win_rate_fig(player_name: str, wins: int, losses: int, draws: int,
+                        colors: Tuple[str, str, str], _layout: go.Layout) -> go.Figure:
+    """Builds the win rate pie chart of a player"""
+    return go.Figure(
+        data=[go.Pie(
+            labels=['Victories', 'Defeats', 'Draws'],
+            values=[wins, losses, draws],
+            hole=.3,
+            marker_colors=list(colors)
+        )],
+        layout=go.Layout(_layout, title=f"Win Rate: {player_name}")
+    )
+
+@st.cache_data(ttl="5m", max_entries=100)
+def _battle_summary(battles: List[Dict]) -> Tuple[pd.DataFrame, int]:
+    """Builds the battle log table and counts its victories (cached on the battle contents, like the battle log request)"""
+    df = pd.DataFrame.from_records(battles)
+    victories = int(np.count_nonzero(df['Result'].to_numpy() == 'Victory'))
+    return df, victories
 
 class BrawlStarsUI:
     """
@@ -10,6 +101,37 @@ class BrawlStarsUI:
     Handles the rendering of all visual elements.
     """
 
+    # Background color of the battle log result cells
+    _RESULT_STYLE = {
+        'Victory': 'background-color: #2E7D32',
+        'Defeat': 'background-color: #C62828',
+        'Draw': 'background-color: #455A64'
+    }
+
+    # Columns and dtypes of the brawler details table
+    _BRAWLER_DTYPES = {
+        'Name': 'string[pyarrow]',
+        'Power': 'int8',
+        'Rank': 'int8',
+        'Trophies': 'int32',
+        'Highest Trophies': 'int32',
+        'Gears': 'string[pyarrow]',
+        'Star Powers': 'string[pyarrow]',
+        'Gadgets': 'string[pyarrow]'
+    }
+
+    # Column configuration of the brawler details table (built once at import)
+    _BRAWLER_COL_CONFIG = {
+        'Name': st.column_config.TextColumn('Name', width='medium'),
+        'Power': st.column_config.NumberColumn('Power', format='%d'),
+        'Rank': st.column_config.NumberColumn('Rank', format='%d'),
+        'Trophies': st.column_config.NumberColumn('Trophies', format='%d'),
+        'Highest Trophies': st.column_config.NumberColumn('Highest', format='%d'),
+        'Gears': st.column_config.TextColumn('Gears', width='large'),
+        'Star Powers': st.column_config.TextColumn('Star Powers', width='large'),
+        'Gadgets': st.column_config.TextColumn('Gadgets', width='large')
+    }
+
     def __init__(self, data_processor):
         """
         Initializes the UI component with default colors and styles
@@ -29,6 +151,8 @@ class BrawlStarsUI:
             'height': 400,
             'template': 'plotly_dark'
         }
+        # Validated once, every chart starts from this layout
+        self._layout_template = go.Layout(**self.chart_config)
         
         self.data_processor = data_processor
 
@@ -58,34 +182,37 @@ class BrawlStarsUI:
                 '👑 Best Brawler': f"{highest_brawler.get('name', '-')} ({highest_brawler.get('trophies', 0)} 🏆)"
             }
 
-            # Display stats in columns
-            for label, value in stats.items():
-                col1, col2 = st.columns([2, 1])
-                with col1:
-                    st.write(f"{label}:")
-                with col2:
-                    if isinstance(value, int):
-                        st.write(f"{value:,}")
-                    else:
-                        st.write(value)
+            # Display all stats as a single markdown table
+            st.markdown(self._stats_table(stats))
 
             # Club information
             if club_info:
-                st.write("---")
-                st.write("🏰 Club Information:")
                 club_stats = {
                     'Name': club_info.get('name', 'No Club'),
                     '🏆 Club Trophies': f"{club_info.get('trophies', 0):,}",
                     '🎯 Required Trophies': f"{club_info.get('requiredTrophies', 0):,}",
                     '👥 Members': f"{len(club_info.get('members', []))}/30"
                 }
-                
-                for label, value in club_stats.items():
-                    col1, col2 = st.columns([2, 1])
-                    with col1:
-                        st.write(f"{label}:")
-                    with col2:
-                        st.write(value)
+                st.markdown(f"---\n\n🏰 Club Information:\n\n{self._stats_table(club_stats)}")
+
+    @staticmethod
+    def _stats_table(stats: Dict[str, Any]) -> str:
+        """
+        Renders label/value pairs as a markdown table.
+
+        Args:
+            stats (Dict[str, Any]): Values by label, ints get thousands separators
+
+        Returns:
+            str: Markdown table
+        """
+        # Preformat every value to a table-safe string first
+        formatted = [
+            (label, f"{value:,}" if isinstance(value, int) else str(value).replace('|', '&#124;'))
+            for label, value in stats.items()
+        ]
+        rows = "\n".join(f"| {label} | {value} |" for label, value in formatted)
+        return f"| Stat | Value |\n|---|---:|\n{rows}"
 
     def create_comparison_charts(self, player1_data: Dict, player2_data: Dict) -> None:
         """
@@ -111,33 +238,17 @@ class BrawlStarsUI:
             player1_data (Dict): Data of the first player
             player2_data (Dict): Data of the second player
         """
-        trophy_data = pd.DataFrame({
-            'Metric': ['Current Trophies', 'Highest Trophies'],
-            player1_data['name']: [
-                player1_data['trophies'],
-                player1_data['highestTrophies']
-            ],
-            player2_data['name']: [
-                player2_data['trophies'],
-                player2_data['highestTrophies']
-            ]
-        })
+        # Nothing to compare for fresh accounts
+        if max(player1_data['trophies'], player1_data['highestTrophies'],
+               player2_data['trophies'], player2_data['highestTrophies']) == 0:
+            st.info("No trophy data to compare")
+            return
 
-        fig = px.bar(
-            trophy_data,
-            x='Metric',
-            y=[player1_data['name'], player2_data['name']],
-            barmode='group',
-            title='Trophy Comparison',
-            **self.chart_config
+        fig = _build_trophy_fig(
+            player1_data['name'], player1_data['trophies'], player1_data['highestTrophies'],
+            player2_data['name'], player2_data['trophies'], player2_data['highestTrophies'],
+            self._layout_template
         )
-        
-        fig.update_layout(
-            xaxis_title="",
-            yaxis_title="Trophies",
-            legend_title="Player"
-        )
-        
         st.plotly_chart(fig, use_container_width=True)
 
     def _create_victories_comparison(self, player1_data: Dict, player2_data: Dict) -> None:
@@ -148,35 +259,19 @@ class BrawlStarsUI:
             player1_data (Dict): Data of the first player
             player2_data (Dict): Data of the second player
         """
-        victory_data = pd.DataFrame({
-            'Mode': ['3v3', 'Solo', 'Duo'],
-            player1_data['name']: [
-                player1_data.get('3vs3Victories', 0),
-                player1_data.get('soloVictories', 0),
-                player1_data.get('duoVictories', 0)
-            ],
-            player2_data['name']: [
-                player2_data.get('3vs3Victories', 0),
-                player2_data.get('soloVictories', 0),
-                player2_data.get('duoVictories', 0)
-            ]
-        })
+        victories1 = [player1_data.get(key, 0) for key in ('3vs3Victories', 'soloVictories', 'duoVictories')]
+        victories2 = [player2_data.get(key, 0) for key in ('3vs3Victories', 'soloVictories', 'duoVictories')]
 
-        fig = px.bar(
-            victory_data,
-            x='Mode',
-            y=[player1_data['name'], player2_data['name']],
-            barmode='group',
-            title='Victory Comparison',
-            **self.chart_config
-        )
-        
-        fig.update_layout(
-            xaxis_title="Game Mode",
-            yaxis_title="Number of Victories",
-            legend_title="Player"
+        # Nothing to compare if neither player has won a game yet
+        if max(victories1 + victories2) == 0:
+            st.info("No victory data to compare")
+            return
+
+        fig = _build_victories_fig(
+            player1_data['name'], *victories1,
+            player2_data['name'], *victories2,
+            self._layout_template
         )
-        
         st.plotly_chart(fig, use_container_width=True)
 
     def display_battle_log(self, battles: List[Dict], player_name: str, 
@@ -192,8 +287,8 @@ class BrawlStarsUI:
                 return
             
             # Calculate statistics
-            total_games = len(battles)
-            victories = sum(1 for battle in battles if battle['Result'] == 'Victory')
+            battles_df, victories = _battle_summary(battles)
+            total_games = len(battles_df)
             win_rate = (victories / total_games * 100) if total_games > 0 else 0
             
             # Show summary
@@ -209,7 +304,7 @@ class BrawlStarsUI:
             
             # Battle log table
             st.write("🎮 Detailed Games:")
-            st.dataframe(pd.DataFrame(battles))
+            st.dataframe(battles_df)
 
     def _style_battle_results(self, df: pd.DataFrame) -> List:
         """
@@ -221,28 +316,36 @@ class BrawlStarsUI:
         Returns:
             List: List with styling properties
         """
-        return ['background-color: #2E7D32' if x == 'Victory'
-                else 'background-color: #C62828' if x == 'Defeat'
-                else 'background-color: #455A64' if x == 'Draw'
-                else '' for x in df]
+        # Plain object values, so categorical result columns are replaced the same way
+        results = df.astype(object)
+        styled = results.replace(self._RESULT_STYLE).where(results.isin(list(self._RESULT_STYLE)), '')
+        return styled.values.tolist()
 
-    def show_error_message(self, message: str) -> None:
+    def show_error_message(self, message: str, transient: bool = False) -> None:
         """
         Shows an error message.
 
         Args:
             message (str): Error message to display
+            transient (bool): Show a toast instead of a persistent error box
         """
-        st.error(f"⚠️ {message}")
+        if transient:
+            st.toast(message, icon="⚠️")
+        else:
+            st.error(f"⚠️ {message}")
 
-    def show_success_message(self, message: str) -> None:
+    def show_success_message(self, message: str, transient: bool = False) -> None:
         """
         Shows a success message.
 
         Args:
             message (str): Success message to display
+            transient (bool): Show a toast instead of a persistent success box
         """
-        st.success(f"✅ {message}")
+        if transient:
+            st.toast(message, icon="✅")
+        else:
+            st.success(f"✅ {message}")
 
     def create_win_rate_chart(self, statistics: Dict[str, Any], player_name: str) -> None:
         """
@@ -252,20 +355,11 @@ class BrawlStarsUI:
             statistics (Dict[str, Any]): Player statistics
             player_name (str): Name of the player
         """
-        fig = go.Figure(data=[go.Pie(
-            labels=['Victories', 'Defeats', 'Draws'],
-            values=[statistics['wins'], statistics['losses'], statistics['draws']],
-            hole=.3,
-            marker_colors=[self.colors['victory'], 
-                         self.colors['defeat'], 
-                         self.colors['draw']]
-        )])
-        
-        fig.update_layout(
-            title=f"Win Rate: {player_name}",
-            **self.chart_config
+        fig = _build_win_rate_fig(
+            player_name, statistics['wins'], statistics['losses'], statistics['draws'],
+            (self.colors['victory'], self.colors['defeat'], self.colors['draw']),
+            self._layout_template
         )
-        
         st.plotly_chart(fig, use_container_width=True)
 
     def display_brawler_stats(self, stats: Dict, column) -> None:
@@ -273,18 +367,16 @@ class BrawlStarsUI:
         with column:
             st.subheader("Brawler Statistics")
             
-            # Create three rows of metrics
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.metric("Total Brawlers", stats.get('total_brawlers', 0))
-                st.metric("Power 9+ Brawlers", stats.get('high_level_brawlers', 0))
-                st.metric("Power 11 Brawlers", stats.get('max_level_brawlers', 0))
-            
-            with col2:
-                st.metric("Total Gears", stats.get('total_gears', 0))
-                st.metric("Total Star Powers", stats.get('total_starpowers', 0))
-                st.metric("Total Gadgets", stats.get('total_gadgets', 0))
+            # Three rows of two metrics in a single element
+            metrics = [
+                ("Total Brawlers", stats.get('total_brawlers', 0)),
+                ("Total Gears", stats.get('total_gears', 0)),
+                ("Power 9+ Brawlers", stats.get('high_level_brawlers', 0)),
+                ("Total Star Powers", stats.get('total_starpowers', 0)),
+                ("Power 11 Brawlers", stats.get('max_level_brawlers', 0)),
+                ("Total Gadgets", stats.get('total_gadgets', 0))
+            ]
+            st.markdown(metric_grid_html(metrics, columns=2), unsafe_allow_html=True)
 
     def display_brawler_details(self, brawler_details: List[Dict], column) -> None:
         """
@@ -297,22 +389,14 @@ class BrawlStarsUI:
         with column:
             st.subheader("Detailed Brawler Information")
             
-            # Convert to DataFrame for better display
-            df = pd.DataFrame(brawler_details)
+            # Convert to DataFrame with explicit columns and compact dtypes for better display
+            df = pd.DataFrame.from_records(brawler_details, columns=list(self._BRAWLER_DTYPES))
+            df = df.astype(self._BRAWLER_DTYPES)
             
             # Configure column display
             st.dataframe(
                 df,
-                column_config={
-                    'Name': st.column_config.TextColumn('Name', width='medium'),
-                    'Power': st.column_config.NumberColumn('Power', format='%d'),
-                    'Rank': st.column_config.NumberColumn('Rank', format='%d'),
-                    'Trophies': st.column_config.NumberColumn('Trophies', format='%d'),
-                    'Highest Trophies': st.column_config.NumberColumn('Highest', format='%d'),
-                    'Gears': st.column_config.TextColumn('Gears', width='large'),
-                    'Star Powers': st.column_config.TextColumn('Star Powers', width='large'),
-                    'Gadgets': st.column_config.TextColumn('Gadgets', width='large')
-                },
+                column_config=self._BRAWLER_COL_CONFIG,
                 hide_index=True,
                 use_container_width=True
             )